@@ -1,7 +1,16 @@
+import asyncio
 import os
-import shutil
-import subprocess
+from functools import lru_cache
 from typing import Dict, Optional
+from valrep.fileutils import fast_copy
+from valrep.manifest import output_done
+from valrep.process import resolve_executable, run_command
+
+@lru_cache(maxsize=None)
+def _adl_basename(adl_file: str) -> str:
+    """ADL file name without directory and extension (computed once per file)."""
+    return os.path.splitext(os.path.basename(adl_file))[0]
+
 
 class CutLangStep:
     """
@@ -30,10 +39,18 @@ class CutLangStep:
             If True, the step will skip execution if output already exists.
         **kwargs
             Any additional parameters are stored in self.config.
+
+        Raises
+        ------
+        FileNotFoundError
+            If CLA_EXEC is not set or does not point to an executable.
         """
         self.config = config or kwargs or {}
         self.skip_if_done = skip_if_done
 
+        # CutLang executable, resolved once for all points
+        self.cla_exec = resolve_executable("CLA_EXEC")
+
     def is_done(self, point_dir: str, adl_file: str) -> bool:
         """
         Check if CutLang output already exists for a given parameter point.
@@ -50,11 +67,10 @@ class CutLangStep:
         bool
             True if the output ROOT file exists and is non-empty.
         """
-        adl_basename = os.path.splitext(os.path.basename(adl_file))[0]
-        output_root = os.path.join(point_dir, self.name, f"histoOut-{adl_basename}.root")
-        return os.path.exists(output_root) and os.path.getsize(output_root) > 0
+        output_root = os.path.join(point_dir, self.name, f"histoOut-{_adl_basename(adl_file)}.root")
+        return output_done(point_dir, self.name, [output_root])
 
-    def run(
+    async def run(
         self,
         config: Optional[Dict] = None,
         point_dir: Optional[str] = None,
@@ -81,19 +97,16 @@ class CutLangStep:
         ------
         ValueError
             If prev_output is None.
-        FileNotFoundError
-            If CLA_EXEC environment variable is not set.
         """
         # Use provided config or default
         cfg = (self.config if config is None else config).get("cutlang", {})
         adl_file = cfg["adl_file"]
-        adl_basename = os.path.splitext(os.path.basename(adl_file))[0]
 
         # Ensure step directory exists
         step_dir = os.path.join(point_dir, self.name)
         os.makedirs(step_dir, exist_ok=True)
 
-        output_root = os.path.join(step_dir, f"histoOut-{adl_basename}.root")
+        output_root = os.path.join(step_dir, f"histoOut-{_adl_basename(adl_file)}.root")
 
         # Skip if output already exists
         if self.skip_if_done and self.is_done(point_dir, adl_file):
@@ -103,18 +116,13 @@ class CutLangStep:
         if prev_output is None:
             raise ValueError(f"[{self.name}] prev_output is None. CutLang requires input from previous step!")
 
-        # CutLang executable
-        cla_exec = os.environ.get("CLA_EXEC")
-        if cla_exec is None:
-            raise FileNotFoundError("CLA_EXEC environment variable not set!")
-
         root_type = cfg.get("root_type", "DELPHES")
 
         # Run CutLang
-        subprocess.run([cla_exec, prev_output, root_type, "-i", adl_file], cwd=step_dir, check=True)
+        await run_command([self.cla_exec, prev_output, root_type, "-i", adl_file], cwd=step_dir)
 
         # Copy results to global cutlang_results directory
-        all_points_dir = os.path.abspath(os.path.join(point_dir, ".."))
+        all_points_dir = os.path.dirname(os.path.abspath(point_dir))
         cutlang_results_dir = os.path.join(all_points_dir, "cutlang_results")
         os.makedirs(cutlang_results_dir, exist_ok=True)
 
@@ -122,7 +130,11 @@ class CutLangStep:
         final_name = f"{mass_name}.root"
         final_path = os.path.join(cutlang_results_dir, final_name)
 
-        shutil.copy(output_root, final_path)
+        await asyncio.to_thread(fast_copy, output_root, final_path)
         print(f"[{self.name}] Output copied to {final_path}")
 
-        return final_path
\ No newline at end of file
+        return final_path
+
+
+# Class registered by StepManager for this step
+STEP_CLASS = CutLangStep
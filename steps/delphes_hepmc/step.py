@@ -1,8 +1,10 @@
+import asyncio
 import os
 import gzip
 import shutil
-import subprocess
 from typing import Dict, Optional
+from valrep.manifest import output_done
+from valrep.process import resolve_executable, run_command, run_command_stdin, run_piped
 
 class DelphesHEPMCStep:
     """
@@ -10,6 +12,11 @@ class DelphesHEPMCStep:
 
     This step runs Delphes on a gzip-compressed hepmc file, producing
     a ROOT output file. Each parameter point is processed separately.
+    The input is decompressed on the fly into Delphes' stdin, so no
+    uncompressed copy is written to disk. `pigz` is used for the
+    decompression when available, Python's gzip module otherwise.
+    For Delphes builds that cannot read stdin, set `stream_input: false`;
+    the input is then unpacked to `scratch_dir` (default /dev/shm).
 
     Attributes
     ----------
@@ -35,10 +42,44 @@ class DelphesHEPMCStep:
             Skip this step if output already exists.
         kwargs : dict
             Additional unused parameters.
+
+        Raises
+        ------
+        FileNotFoundError
+            If DELPHES_EXEC is not set or does not point to an executable.
         """
         self.config = config or kwargs or {}
         self.skip_if_done = skip_if_done
 
+        # Delphes and (optional) pigz executables, resolved once for all points
+        self.delphes_exec = resolve_executable("DELPHES_EXEC")
+        self.pigz_exec = shutil.which("pigz")
+
+    @staticmethod
+    def _default_scratch_dir(step_dir: str) -> str:
+        """
+        Directory for the temporary HEPMC file when input is not streamed.
+
+        Returns /dev/shm (RAM-backed tmpfs) if writable, else the step directory.
+        """
+        if os.access("/dev/shm", os.W_OK):
+            return "/dev/shm"
+        return step_dir
+
+    @staticmethod
+    def _gunzip(src: str, f_out) -> None:
+        """Decompress a gzip file into an open binary file object."""
+        with gzip.open(src, "rb") as f_in:
+            shutil.copyfileobj(f_in, f_out, 1 << 20)
+
+    @staticmethod
+    def _discard(path: str) -> None:
+        """Remove a (possibly partial) output file if it exists."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
     def is_done(self, point_dir: str) -> bool:
         """
         Check if the ROOT output already exists.
@@ -54,9 +95,9 @@ class DelphesHEPMCStep:
             True if output exists and is non-empty, False otherwise.
         """
         output_root = os.path.join(point_dir, self.name, "delphes_output.root")
-        return os.path.exists(output_root) and os.path.getsize(output_root) > 0
+        return output_done(point_dir, self.name, [output_root])
 
-    def run(
+    async def run(
         self,
         config: Optional[Dict] = None,
         point_dir: Optional[str] = None,
@@ -83,8 +124,6 @@ class DelphesHEPMCStep:
         ------
         ValueError
             If point_dir or prev_output is invalid.
-        FileNotFoundError
-            If DELPHES_EXEC environment variable is not set.
         """
         if point_dir is None:
             raise ValueError(f"[{self.name}] point_dir cannot be None!")
@@ -97,10 +136,6 @@ class DelphesHEPMCStep:
             print(f"[{self.name}] Output already exists, skipping.")
             return output_root
 
-        delphes_exec = os.environ.get("DELPHES_EXEC")
-        if delphes_exec is None:
-            raise FileNotFoundError(f"[{self.name}] DELPHES_EXEC not set!")
-
         step_cfg = (config or self.config).get("delphes", {})
         delphes_card = step_cfg.get("card_path")
         if delphes_card is None:
@@ -109,16 +144,50 @@ class DelphesHEPMCStep:
         if prev_output is None or not os.path.exists(prev_output):
             raise ValueError(f"[{self.name}] Invalid prev_output: {prev_output}")
 
-        # Unpack gzip HEPMC to temporary file
-        tmp_hepmc = os.path.join(step_dir, "input.hepmc")
-        with gzip.open(prev_output, "rb") as f_in, open(tmp_hepmc, "wb") as f_out:
-            shutil.copyfileobj(f_in, f_out)
+        delphes_cmd = [self.delphes_exec, delphes_card, output_root]
+
+        if step_cfg.get("stream_input", True):
+            # Run Delphes, streaming the decompressed HEPMC through its stdin
+            # (DelphesHepMC2 reads standard input when no input file is given)
+            print(f"[{self.name}] Running Delphes: {prev_output} -> {output_root}")
+            try:
+                if self.pigz_exec is not None:
+                    await run_piped([self.pigz_exec, "-dc", prev_output], delphes_cmd, cwd=step_dir)
+                else:
+                    with gzip.open(prev_output, "rb") as f_in:
+                        await run_command_stdin(delphes_cmd, f_in, cwd=step_dir)
+            except BaseException:
+                # Never leave output built from partial input behind; with pigz,
+                # Delphes may exit 0 on a truncated stream while pigz fails
+                self._discard(output_root)
+                raise
+        else:
+            # Unpack gzip HEPMC to a temporary file, in RAM (tmpfs) when possible
+            scratch_dir = step_cfg.get("scratch_dir") or self._default_scratch_dir(step_dir)
+            os.makedirs(scratch_dir, exist_ok=True)
+            tmp_hepmc = os.path.join(
+                scratch_dir, f"valrep-{os.getpid()}-{os.path.basename(point_dir)}.hepmc"
+            )
+            try:
+                with open(tmp_hepmc, "wb") as f_out:
+                    if self.pigz_exec is not None:
+                        await run_command([self.pigz_exec, "-dc", prev_output], stdout=f_out)
+                    else:
+                        await asyncio.to_thread(self._gunzip, prev_output, f_out)
+
+                print(f"[{self.name}] Running Delphes: {tmp_hepmc} -> {output_root}")
+                await run_command(delphes_cmd + [tmp_hepmc], cwd=step_dir)
+            except BaseException:
+                # A crashed Delphes run may leave a non-empty ROOT file behind
+                self._discard(output_root)
+                raise
+            finally:
+                # Clean up temporary HEPMC
+                if os.path.exists(tmp_hepmc):
+                    os.remove(tmp_hepmc)
 
-        # Run Delphes
-        print(f"[{self.name}] Running Delphes: {tmp_hepmc} -> {output_root}")
-        subprocess.run([delphes_exec, delphes_card, output_root, tmp_hepmc], cwd=step_dir, check=True)
+        return output_root
 
-        # Clean up temporary HEPMC
-        os.remove(tmp_hepmc)
 
-        return output_root
+# Class registered by StepManager for this step
+STEP_CLASS = DelphesHEPMCStep
@@ -1,8 +1,11 @@
+import asyncio
 import os
-import shutil
-import subprocess
+from collections import deque
 from typing import Dict, Optional
+from valrep.fileutils import fast_copy
+from valrep.manifest import output_done
 from valrep.modifiers import evaluate_formula
+from valrep.process import resolve_executable, run_command
 
 class MadGraphStep:
     """
@@ -22,36 +25,54 @@ class MadGraphStep:
         :param skip_if_done: Skip if outputs already exist
         :param run_name: Event generation tag
         :param kwargs: Extra arguments forwarded by StepManager
+        :raises FileNotFoundError: MG5_EXEC not set or not an executable
         """
         self.config = config or kwargs or {}
         self.skip_if_done = skip_if_done
         self.run_name = run_name
 
-    def is_done(self, point_dir: str) -> bool:
+        # MG5 executable, resolved once for all points
+        self.mg_exec = resolve_executable("MG5_EXEC")
+
+    def _output_paths(self, point_dir: str):
+        """
+        Compute the per-point paths used by this step, once.
+
+        :param point_dir: Directory for model point
+        :return: Tuple (step_dir, events_dir, lhe_out, hepmc_out)
+        """
+        _j = os.path.join
+        step_dir = _j(point_dir, self.name)
+        all_points_dir = os.path.dirname(os.path.abspath(point_dir))
+        mass_name = os.path.basename(point_dir)
+        return (
+            step_dir,
+            _j(step_dir, "Events", self.run_name),
+            _j(all_points_dir, "mg5_events_lhe", f"{mass_name}.lhe.gz"),
+            _j(all_points_dir, "mg5py8_events_hepmc", f"{mass_name}.hepmc.gz"),
+        )
+
+    def is_done(self, point_dir: str, paths: Optional[tuple] = None) -> bool:
         """
         Check if event generation output already exists.
 
         :param point_dir: Directory for model point
+        :param paths: Result of `_output_paths(point_dir)`, if already computed
         :return: True if any expected event file exists
         """
-        step_dir = os.path.join(point_dir, self.name)
-        all_points_dir = os.path.abspath(os.path.join(point_dir, ".."))
-        mass_name = os.path.basename(point_dir)
+        _, events_dir, lhe_out, hepmc_out = paths or self._output_paths(point_dir)
 
         # Candidate output files
         candidates = [
-            os.path.join(step_dir, "Events", self.run_name, "unweighted_events.lhe.gz"),
-            os.path.join(all_points_dir, "mg5_events_lhe", f"{mass_name}.lhe.gz"),
-            os.path.join(all_points_dir, "mg5py8_events_hepmc", f"{mass_name}.hepmc.gz"),
+            os.path.join(events_dir, "unweighted_events.lhe.gz"),
+            lhe_out,
+            hepmc_out,
         ]
 
-        # Check size and existence
-        for file_path in candidates:
-            if os.path.exists(file_path) and os.path.getsize(file_path) > 1024:
-                return True
-        return False
+        # Check the manifest, then size and existence, stopping at the first hit
+        return output_done(point_dir, self.name, candidates, min_bytes=1024)
 
-    def run(self, config: Dict, point_dir: str, prev_output: Optional[str] = None) -> str:
+    async def run(self, config: Dict, point_dir: str, prev_output: Optional[str] = None) -> str:
         """
         Run MG5, edit cards, generate events, run Pythia8, and store outputs.
 
@@ -61,19 +82,16 @@ class MadGraphStep:
         :return: Path to produced LHE or HEPMC file
         """
         print(f"[{self.name}] Starting: {point_dir}")
-        step_dir = os.path.join(point_dir, self.name)
+        paths = self._output_paths(point_dir)
+        step_dir, events_dir, lhe_out, hepmc_out = paths
         os.makedirs(step_dir, exist_ok=True)
 
         # Output directories
-        all_points_dir = os.path.abspath(os.path.join(point_dir, ".."))
-        mass_name = os.path.basename(point_dir)
-        lhe_out = os.path.join(all_points_dir, "mg5_events_lhe", f"{mass_name}.lhe.gz")
-        hepmc_out = os.path.join(all_points_dir, "mg5py8_events_hepmc", f"{mass_name}.hepmc.gz")
         os.makedirs(os.path.dirname(lhe_out), exist_ok=True)
         os.makedirs(os.path.dirname(hepmc_out), exist_ok=True)
 
         # Skip if outputs already exist
-        if self.skip_if_done and self.is_done(point_dir):
+        if self.skip_if_done and self.is_done(point_dir, paths):
             print(f"[{self.name}] Existing output found, skipping.")
             if os.path.exists(hepmc_out):
                 return hepmc_out
@@ -82,123 +100,123 @@ class MadGraphStep:
             else:
                 return ""
 
-        # MG5 executable
-        mg_exec = os.environ.get("MG5_EXEC")
-        if mg_exec is None:
-            raise FileNotFoundError("MG5_EXEC environment variable not set!")
-
         # MG5 config
         step_cfg = self.config.get("madgraph", self.config)
         proc_card_path = step_cfg["proc_card"]
-        mg_dir = os.path.dirname(mg_exec)
+        mg_dir = os.path.dirname(self.mg_exec)
+
+        log_file_path = os.path.join(point_dir, f"{self.name}_full.log")
 
         # Rewrite proc card with output directory
         new_proc_card = os.path.join(step_dir, os.path.basename(proc_card_path))
+        saw_output = False
         with open(proc_card_path, "r") as f_in, open(new_proc_card, "w") as f_out:
-            lines = f_in.readlines()
-            for line in lines:
-                if line.strip().startswith("output"):
+            for line in f_in:
+                if line.lstrip().startswith("output"):
                     f_out.write(f"output {step_dir}\n")
+                    saw_output = True
                 else:
                     f_out.write(line)
-            if not any(l.strip().startswith("output") for l in lines):
+            if not saw_output:
                 f_out.write(f"output {step_dir}\n")
 
-        # Launch MG5
-        print(f"[{self.name}] Launching MG5...")
-        log_file_path = os.path.join(point_dir, f"{self.name}_full.log")
-        with open(log_file_path, "w") as log_file:
-            proc = subprocess.Popen(
-                [mg_exec, "-f", os.path.abspath(new_proc_card)],
+        # Launch MG5; its (very verbose) output goes straight to the log file
+        print(f"[{self.name}] Launching MG5 (log: {log_file_path})...")
+        with open(log_file_path, "wb") as log_file:
+            proc = await asyncio.create_subprocess_exec(
+                self.mg_exec, "-f", os.path.abspath(new_proc_card),
                 cwd=mg_dir,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
+                stdout=log_file,
+                stderr=asyncio.subprocess.STDOUT,
             )
-            for line in proc.stdout:
-                log_file.write(line)
-                if line.startswith("INFO"):
-                    print(line, end="")
-            proc.wait()
+            await proc.wait()
 
         # MG5 status check
         if proc.returncode != 0:
+            # Show the end of the log to point at the failure
+            with open(log_file_path, "r", errors="replace") as log_file:
+                print("".join(deque(log_file, maxlen=20)), end="")
             raise RuntimeError(f"[{self.name}] MG5 failed (log: {log_file_path})")
 
         print(f"[{self.name}] MG5 completed successfully.")
 
-        # Build edit_cards script
+        # Build edit_cards commands
         run_settings = step_cfg.get("run_settings", {})
         param_space = config.get("parameter_space", {})
-        edit_script = os.path.join(step_dir, "edit_cards.mg5")
-
-        with open(edit_script, "w") as f:
-            f.write("edit_cards\n")
-            f.write("shower = OFF\n")
-            f.write("detector = OFF\n")
-            f.write("analysis = OFF\n")
-            f.write("madspin = OFF\n")
-            f.write("reweight = OFF\n")
-            f.write("done\n")
-
-            # Use previous SLHA if provided
-            if prev_output:
-                f.write(f"{prev_output}\n")
-                f.write("update to_slha2\n")
-                f.write("update missing\n")
-
-            # Set run_card parameters
-            for key, val in run_settings.items():
-                evaluated = evaluate_formula(val, param_space)
-                if evaluated is None:
-                    print(f"[{self.name}] Warning: could not evaluate {key} = {val}")
-                    continue
-
-                # Format numbers safely
-                evaluated_str = (
-                    str(int(evaluated)) if isinstance(evaluated, (int, float)) and float(evaluated).is_integer()
-                    else f"{evaluated:.6g}" if isinstance(evaluated, float)
-                    else str(evaluated)
-                )
-                f.write(f"set run_card {key} {evaluated_str}\n")
-            f.write("done\n")
 
-        # Madevent binary
-        madevent_exec = os.path.join(step_dir, "bin", "madevent")
-        if not os.path.exists(madevent_exec):
-            raise FileNotFoundError(f"Madevent not found: {madevent_exec}")
+        edit_cmds = [
+            "edit_cards\n",
+            "shower = OFF\n",
+            "detector = OFF\n",
+            "analysis = OFF\n",
+            "madspin = OFF\n",
+            "reweight = OFF\n",
+            "done\n",
+        ]
 
-        # Edit cards
-        print(f"[{self.name}] Running Madevent edit_cards...")
-        subprocess.run([madevent_exec, edit_script], cwd=step_dir, check=True)
+        # Use previous SLHA if provided
+        if prev_output:
+            edit_cmds.append(f"{prev_output}\n")
+            edit_cmds.append("update to_slha2\n")
+            edit_cmds.append("update missing\n")
+
+        # Set run_card parameters
+        for key, val in run_settings.items():
+            evaluated = evaluate_formula(val, param_space)
+            if evaluated is None:
+                print(f"[{self.name}] Warning: could not evaluate {key} = {val}")
+                continue
+
+            # Format numbers safely
+            evaluated_str = (
+                str(int(evaluated)) if isinstance(evaluated, (int, float)) and float(evaluated).is_integer()
+                else f"{evaluated:.6g}" if isinstance(evaluated, float)
+                else str(evaluated)
+            )
+            edit_cmds.append(f"set run_card {key} {evaluated_str}\n")
+        edit_cmds.append("done\n")
 
         # Generate events
-        gen_script = os.path.join(step_dir, "generate_events_script.mg5")
-        with open(gen_script, "w") as f:
-            f.write("generate_events -f\n")
-        subprocess.run([madevent_exec, gen_script], cwd=step_dir, check=True)
+        gen_cmds = ["generate_events -f\n"]
 
-        # Pythia8 script
+        # Pythia8 commands
         pythia8_settings = step_cfg.get("pythia8_settings", {})
-        pythia_script = os.path.join(step_dir, "run_pythia8.mg5")
-        with open(pythia_script, "w") as f:
-            f.write(f"pythia8 --tag={self.run_name}\n")
-            f.write("pythia8\n")
-            for key, val in pythia8_settings.items():
-                f.write(f"set {key} {val}\n")
-            f.write("done\n")
-        subprocess.run([madevent_exec, pythia_script], cwd=step_dir, check=True)
+        pythia_cmds = [f"pythia8 --tag={self.run_name}\n", "pythia8\n"]
+        for key, val in pythia8_settings.items():
+            pythia_cmds.append(f"set {key} {val}\n")
+        pythia_cmds.append("done\n")
+
+        # Madevent binary
+        madevent_exec = os.path.join(step_dir, "bin", "madevent")
+        if not os.path.exists(madevent_exec):
+            raise FileNotFoundError(f"Madevent not found: {madevent_exec}")
+
+        if step_cfg.get("single_madevent_session", True):
+            # One madevent session runs all three stages, so MG5 starts up only once
+            scripts = [("combined.mg5", edit_cmds + gen_cmds + pythia_cmds)]
+        else:
+            # Fallback for MG5 versions that cannot chain the stages in one script
+            scripts = [
+                ("edit_cards.mg5", edit_cmds),
+                ("generate_events_script.mg5", gen_cmds),
+                ("run_pythia8.mg5", pythia_cmds),
+            ]
+
+        for script_name, cmds in scripts:
+            script_path = os.path.join(step_dir, script_name)
+            with open(script_path, "w") as f:
+                f.writelines(cmds)
+            print(f"[{self.name}] Running Madevent {script_name}...")
+            await run_command([madevent_exec, script_path], cwd=step_dir)
 
         # Collect outputs
-        events_dir = os.path.join(step_dir, "Events", self.run_name)
         lhe_gz = os.path.join(events_dir, "unweighted_events.lhe.gz")
         hepmc_gz = os.path.join(events_dir, f"{self.run_name}_pythia8_events.hepmc.gz")
 
         if os.path.exists(lhe_gz):
-            shutil.copy(lhe_gz, lhe_out)
+            await asyncio.to_thread(fast_copy, lhe_gz, lhe_out)
         if os.path.exists(hepmc_gz):
-            shutil.copy(hepmc_gz, hepmc_out)
+            await asyncio.to_thread(fast_copy, hepmc_gz, hepmc_out)
 
         # Return available file
         if os.path.exists(hepmc_out):
@@ -207,3 +225,7 @@ class MadGraphStep:
 #            return lhe_out
         else:
             raise FileNotFoundError("MG5 did not produce any output files.")
+
+
+# Class registered by StepManager for this step
+STEP_CLASS = MadGraphStep
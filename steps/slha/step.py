@@ -1,5 +1,8 @@
 import os
-import shutil
+import re
+from valrep.fileutils import fast_copy
+from valrep.manifest import output_done
+
 
 class SLHAStep:
     name = "slha"
@@ -14,6 +17,35 @@ class SLHAStep:
         """
         self.slha_template = slha_template
         self.skip_if_done = skip_if_done
+        self._template_cache = None
+
+    def _template_format(self, names):
+        """
+        Return the SLHA template as a `str.format` format string.
+
+        The template is read once per template path and converted once
+        per set of parameter names: literal braces are escaped and every
+        `.NAME.` becomes a positional field, so names need not be Python
+        identifiers (e.g. `M-SQ`, `1A`). Other `.X.` markers are kept.
+
+        :param names: Tuple of parameter names, in field order
+        :return: Format string for the current template and names
+        """
+        if self._template_cache is None or self._template_cache[0] != self.slha_template:
+            with open(self.slha_template, "r") as f:
+                text = f.read()
+            self._template_cache = (self.slha_template, text.replace("{", "{{").replace("}", "}}"), {})
+        _, text, formats = self._template_cache
+
+        if names not in formats:
+            index = {f".{name}.": i for i, name in enumerate(names)}
+            # Longest first, so `.A_1.` is not shadowed by a shorter name
+            markers = sorted(index, key=len, reverse=True)
+            if markers:
+                pattern = re.compile("|".join(re.escape(m) for m in markers))
+                text = pattern.sub(lambda m: f"{{{index[m.group(0)]}}}", text)
+            formats[names] = text
+        return formats[names]
 
     def is_done(self, point_dir):
         """
@@ -23,7 +55,7 @@ class SLHAStep:
         :return: True if file exists and non-empty
         """
         slha_file = os.path.join(point_dir, self.name, "param_card.slha")
-        return os.path.exists(slha_file) and os.path.getsize(slha_file) > 0
+        return output_done(point_dir, self.name, [slha_file])
 
     def run(self, config, point_dir, prev_output=None):
         """
@@ -45,22 +77,14 @@ class SLHAStep:
         if self.skip_if_done and self.is_done(point_dir):
             print(f"[{self.name}] SLHA file exists, skipping.")
         else:
-            # Read template
-            with open(self.slha_template, "r") as f:
-                lines = f.readlines()
-
-            # Replace placeholders with values
-            new_lines = []
-            for line in lines:
-                for pname, pinfo in param_space.items():
-                    placeholder = f".{pname}."
-                    if placeholder in line:
-                        line = line.replace(placeholder, f"{float(pinfo['value']):.8E}")
-                new_lines.append(line)
+            # Fill all placeholders in a single C-level pass
+            names = tuple(param_space)
+            values = [f"{float(param_space[pname]['value']):.8E}" for pname in names]
+            text = self._template_format(names).format(*values)
 
             # Write new SLHA
             with open(slha_file, "w") as f:
-                f.writelines(new_lines)
+                f.write(text)
             print(f"[{self.name}] Generated SLHA: {slha_file}")
 
         # Copy to results dir
@@ -74,7 +98,11 @@ class SLHAStep:
         new_filename = f"{topology}." + "_".join(param_parts) + ".slha"
 
         dest_path = os.path.join(results_dir, new_filename)
-        shutil.copyfile(slha_file, dest_path)
+        fast_copy(slha_file, dest_path)
         print(f"[{self.name}] Copied to: {dest_path}")
 
-        return slha_file
\ No newline at end of file
+        return slha_file
+
+
+# Class registered by StepManager for this step
+STEP_CLASS = SLHAStep
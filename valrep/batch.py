@@ -0,0 +1,105 @@
+"""
+Parallel driver for the valrep
+
+This module runs the full step chain of many parameter points
+concurrently, one pipeline per point.
+"""
+
+import asyncio
+import os
+
+
+async def run_point(workflow, point_cfg):
+    """
+    Run every workflow step for a single parameter point.
+
+    Parameters
+    ----------
+    workflow : Workflow
+        Workflow holding the ordered step instances.
+    point_cfg : dict
+        Point configuration carrying a `job_name` (see JobNameModifier).
+
+    Returns
+    -------
+    Any
+        The output of the last step for this point.
+    """
+    point_name = point_cfg["job_name"]
+    print(f"\n### POINT: {point_name} ###")
+    return await workflow.run(point_name, config=point_cfg)
+
+
+async def run_batch(workflow, points, max_workers=None):
+    """
+    Run the workflow for many parameter points concurrently.
+
+    Steps chain (SLHA -> MG5 -> Delphes -> CutLang), so each point is
+    handled as one pipeline. Points are fed through a bounded queue to
+    `max_workers` worker coroutines; since the external binaries are
+    launched asynchronously, at most `max_workers` of them run at once
+    while the others wait on the queue.
+
+    Parameters
+    ----------
+    workflow : Workflow
+        Workflow holding the ordered step instances.
+    points : iterable of dict
+        Point configurations, e.g. the output of
+        ``ParameterSpaceModifier.generate()`` passed through JobNameModifier.
+    max_workers : int, optional
+        Number of points processed at once. Defaults to ``os.cpu_count()``.
+
+    Returns
+    -------
+    dict
+        Mapping from point name to the output of its last step.
+
+    Raises
+    ------
+    ValueError
+        If `max_workers` is less than 1.
+    RuntimeError
+        If one or more points failed; the remaining points still run.
+
+    Example
+    -------
+    >>> asyncio.run(run_batch(workflow, points, max_workers=4))
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers < 1:
+        raise ValueError("max_workers must be greater than 0")
+
+    results = {}
+    failures = {}
+    queue = asyncio.Queue(maxsize=2 * max_workers)
+
+    async def worker():
+        while True:
+            cfg = await queue.get()
+            point_name = cfg["job_name"]
+            try:
+                results[point_name] = await run_point(workflow, cfg)
+                print(f"Results [{point_name}]: {results[point_name]}")
+            except Exception as exc:
+                failures[point_name] = exc
+                print(f"Failed [{point_name}]: {exc}")
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(max_workers)]
+    try:
+        # Points are generated lazily; put() waits while the queue is full
+        for cfg in points:
+            await queue.put(cfg)
+        await queue.join()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    if failures:
+        raise RuntimeError(f"{len(failures)} point(s) failed: {', '.join(failures)}")
+
+    return results
@@ -1,11 +1,35 @@
+import copy
 import json
 import os
 import sys
+from functools import lru_cache
 
 def load_config(path):
     """
     Load configuration file in various supported formats.
 
+    Parsed files are cached and re-parsed only when their modification
+    time or size changes; each call returns an independent copy.
+
+    :param path: Path to config file
+    :return: Parsed configuration as dict
+    :raises ValueError: Unsupported or invalid config format
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    return copy.deepcopy(_load_config_cached(path, st.st_mtime_ns, st.st_size))
+
+
+@lru_cache(maxsize=64)
+def _load_config_cached(path, mtime_ns, size):
+    """Parse a config file; `mtime_ns` and `size` only serve as cache key."""
+    return _load_config_uncached(path)
+
+
+def _load_config_uncached(path):
+    """
+    Parse a config file according to its extension.
+
     :param path: Path to config file
     :return: Parsed configuration as dict
     :raises ValueError: Unsupported or invalid config format
@@ -20,8 +44,10 @@ def load_config(path):
     # YAML config
     elif ext in [".yaml", ".yml"]:
         import yaml
+        # Prefer the C-accelerated loader when libyaml is available
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         with open(path, "r") as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=loader)
 
     # TOML config (Python 3.11+)
     elif ext == ".toml":
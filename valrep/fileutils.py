@@ -0,0 +1,61 @@
+"""
+Filesystem helpers shared by the workflow steps.
+"""
+
+import os
+import shutil
+
+
+def stat_nonempty(path, min_bytes=0):
+    """
+    Stat a file if it exists and is larger than `min_bytes`.
+
+    Uses a single stat() call instead of os.path.exists + os.path.getsize,
+    which matters on network filesystems where each stat is a round trip.
+
+    :param path: Path to the file
+    :param min_bytes: Size the file must exceed (default: non-empty)
+    :return: The os.stat_result, or None if the file is missing or too small
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if st.st_size > min_bytes else None
+
+
+def fast_copy(src, dst):
+    """
+    Copy a file's contents in the kernel.
+
+    Uses os.copy_file_range (Linux), which avoids bouncing the data
+    through Python and becomes a reflink (metadata-only) copy on
+    filesystems that support it (Btrfs, XFS, ...). Falls back to
+    shutil.copyfile, which itself uses sendfile where available, on
+    errors or an incomplete copy. Blocking: run it via asyncio.to_thread
+    from coroutines.
+
+    :param src: Source file path
+    :param dst: Destination file path (overwritten)
+    :return: The destination path
+    """
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is not None:
+        try:
+            with open(src, "rb") as f_in, open(dst, "wb") as f_out:
+                remaining = os.fstat(f_in.fileno()).st_size
+                while remaining > 0:
+                    copied = copy_file_range(f_in.fileno(), f_out.fileno(), remaining)
+                    if copied == 0:
+                        # Some filesystems report 0 instead of an error
+                        # when they cannot copy; redo it the portable way
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                return dst
+        except OSError:
+            # e.g. unsupported filesystem or cross-device copy on older kernels
+            pass
+
+    shutil.copyfile(src, dst)
+    return dst
@@ -0,0 +1,151 @@
+"""
+Manifest of finished workflow steps.
+
+A small SQLite database, ``<workdir>/.valrep_done.db``, records which
+(point, step) pairs have produced their output. On restart, the whole
+table is read with one query, so finished steps are recognised without
+a stat() per point and step.
+
+The manifest is only a cache: if SQLite reports an error, the steps
+fall back to checking their output files. Delete the database to force
+a full re-check, e.g. after removing outputs by hand.
+
+Locally the database uses WAL journaling. WAL relies on shared memory
+and is not safe when processes on several hosts share the file, so
+SLURM array tasks (see valrep.runpoint) switch to the rollback journal
+with ``set_journal_mode("DELETE")``. That still requires working POSIX
+locks; on network filesystems without them (e.g. Lustre mounted
+without ``flock``) concurrent writers can corrupt the database silently,
+so delete it if in doubt.
+"""
+
+import os
+import sqlite3
+import threading
+
+from valrep.fileutils import stat_nonempty
+
+DB_NAME = ".valrep_done.db"
+
+_lock = threading.Lock()
+_connections = {}
+_done = {}
+_journal_mode = "WAL"
+
+
+def set_journal_mode(mode):
+    """
+    Choose the SQLite journal mode for manifests opened from now on.
+
+    :param mode: "WAL" (default, single host) or "DELETE" (shared filesystems)
+    """
+    global _journal_mode
+    _journal_mode = mode.upper()
+
+
+def _connect(workdir):
+    """Open (once per process) the manifest database of a workdir."""
+    db_path = os.path.join(workdir, DB_NAME)
+    conn = _connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        try:
+            conn.execute(f"PRAGMA journal_mode={_journal_mode}")
+            # NORMAL is only crash-safe together with WAL
+            conn.execute(f"PRAGMA synchronous={'NORMAL' if _journal_mode == 'WAL' else 'FULL'}")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS done ("
+                " point TEXT NOT NULL,"
+                " step TEXT NOT NULL,"
+                " output_path TEXT NOT NULL,"
+                " size INTEGER,"
+                " mtime_ns INTEGER,"
+                " PRIMARY KEY (point, step))"
+            )
+            conn.commit()
+        except sqlite3.Error:
+            conn.close()
+            raise
+        _connections[db_path] = conn
+    return conn
+
+
+def _load(workdir):
+    """Read all manifest rows of a workdir in one query (cached)."""
+    rows = _done.get(workdir)
+    if rows is None:
+        conn = _connect(workdir)
+        rows = {
+            (point, step): output_path
+            for point, step, output_path in conn.execute("SELECT point, step, output_path FROM done")
+        }
+        _done[workdir] = rows
+    return rows
+
+
+def get_done(workdir, point, step):
+    """
+    Look up a finished step in the manifest.
+
+    :param workdir: Directory holding all parameter points
+    :param point: Name of the parameter point
+    :param step: Name of the step
+    :return: Recorded output path, or None if not recorded (or no manifest)
+    """
+    with _lock:
+        try:
+            return _load(workdir).get((point, step))
+        except sqlite3.Error:
+            return None
+
+
+def mark_done(workdir, point, step, output_path, size=None, mtime_ns=None):
+    """
+    Record a finished step in the manifest.
+
+    :param workdir: Directory holding all parameter points
+    :param point: Name of the parameter point
+    :param step: Name of the step
+    :param output_path: Output file proving the step is done
+    :param size: Size of the output file in bytes
+    :param mtime_ns: Modification time of the output file
+    """
+    with _lock:
+        try:
+            conn = _connect(workdir)
+            conn.execute(
+                "INSERT OR REPLACE INTO done VALUES (?, ?, ?, ?, ?)",
+                (point, step, output_path, size, mtime_ns),
+            )
+            conn.commit()
+            _load(workdir)[(point, step)] = output_path
+        except sqlite3.Error:
+            pass
+
+
+def output_done(point_dir, step, candidates, min_bytes=0):
+    """
+    Check whether a step is done for a point, consulting the manifest first.
+
+    A manifest entry only counts if its recorded output is one of the
+    current `candidates` (the expected outputs change with e.g. the ADL
+    file or the MG5 run name). Otherwise the candidate files are stat'ed
+    and the first one larger than `min_bytes` is recorded, replacing any
+    stale entry.
+
+    :param point_dir: Directory of the parameter point
+    :param step: Name of the step
+    :param candidates: Output files, any of which marks the step as done
+    :param min_bytes: Size a candidate must exceed (default: non-empty)
+    :return: True if the step is recorded or one of its outputs exists
+    """
+    workdir, point = os.path.split(os.path.abspath(point_dir))
+    if get_done(workdir, point, step) in candidates:
+        return True
+
+    for path in candidates:
+        st = stat_nonempty(path, min_bytes)
+        if st is not None:
+            mark_done(workdir, point, step, path, st.st_size, st.st_mtime_ns)
+            return True
+    return False
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from itertools import product
 from typing import Dict, Any
 
@@ -5,6 +6,7 @@ from typing import Dict, Any
 # Helper functions
 # ============================================================
 
+@lru_cache(maxsize=4096)
 def format_float_to_str(value: float) -> str:
     """
     Convert a float into the project's compact `XpY` format (e.g. 125.5 → 125p5).
@@ -13,6 +15,10 @@ def format_float_to_str(value: float) -> str:
     * Replace '.' with 'p'
     * Strip trailing zeros in decimals
     * Use 'p0' if no decimals remain
+
+    Results are memoised: a grid of N points over M parameters only has
+    a handful of distinct values per parameter, so job naming formats
+    each of them once instead of N·M times.
     """
     s = f"{value:.10g}"
     if "." in s:
@@ -22,6 +28,12 @@ def format_float_to_str(value: float) -> str:
     return f"{s}p0"
 
 
+@lru_cache(maxsize=256)
+def _compile_formula(formula: str):
+    """Compile a formula string once; repeated evaluations reuse the code object."""
+    return compile(formula, "<valrep-formula>", "eval")
+
+
 def evaluate_formula(value, param_space):
     """
     Evaluate a string formula (e.g. 'MSQUARK/4') using values from param_space.
@@ -33,7 +45,7 @@ def evaluate_formula(value, param_space):
     if isinstance(value, str):
         local_vars = {k: float(v["value"]) for k, v in param_space.items()}
         try:
-            return float(eval(value, {"__builtins__": {}}, local_vars))
+            return float(eval(_compile_formula(value), {"__builtins__": {}}, local_vars))
         except Exception:
             return value
 
@@ -51,26 +63,31 @@ class ParameterSpaceModifier:
     """
 
     def generate(self, **config):
-        """Yield new configs for each point in the Cartesian product."""
+        """
+        Yield new configs for each point in the Cartesian product.
+
+        The `{"value": v}` entries are built once per parameter value and
+        shared between the yielded points, so treat them as read-only.
+        """
         param_space = config.get("parameter_space", {})
         keys = list(param_space.keys())
 
-        ranges = []
+        axes = []
         for k in keys:
             p = param_space[k]
             if "min" in p and "max" in p and "step" in p:
-                ranges.append(range(p["min"], p["max"] + 1, p["step"]))
+                values = range(p["min"], p["max"] + 1, p["step"])
             elif "value" in p:
-                ranges.append([p["value"]])
+                values = [p["value"]]
             else:
                 raise ValueError(
                     f"For parameter {k}, either min/max/step or value must be defined."
                 )
+            axes.append([{"value": v} for v in values])
 
-        for values in product(*ranges):
-            combo = {k: {"value": v} for k, v in zip(keys, values)}
+        for entries in product(*axes):
             new_cfg = config.copy()
-            new_cfg["parameter_space"] = combo
+            new_cfg["parameter_space"] = dict(zip(keys, entries))
             yield new_cfg
 
 
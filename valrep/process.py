@@ -0,0 +1,149 @@
+"""
+Asynchronous helpers for launching the external tools (MG5, Delphes, CutLang).
+"""
+
+import asyncio
+import os
+import shutil
+import subprocess
+
+
+def resolve_executable(env_var):
+    """
+    Resolve the executable named by an environment variable.
+
+    Called once when a step is created, so a missing tool fails fast
+    instead of on every parameter point.
+
+    :param env_var: Environment variable holding the path (e.g. "CLA_EXEC")
+    :return: Absolute path of the executable
+    :raises FileNotFoundError: Variable not set, or not pointing to an executable
+    """
+    value = os.environ.get(env_var)
+    if value is None:
+        raise FileNotFoundError(f"{env_var} environment variable not set!")
+    path = shutil.which(value)
+    if path is None:
+        raise FileNotFoundError(f"{env_var} does not point to an executable: {value}")
+    return os.path.abspath(path)
+
+
+async def run_command(cmd, cwd=None, **kwargs):
+    """
+    Run an external command without blocking the event loop.
+
+    Equivalent to ``subprocess.run(cmd, cwd=cwd, check=True)``: output
+    goes to the parent's stdout/stderr unless redirected via kwargs.
+
+    :param cmd: Command and arguments as a list
+    :param cwd: Working directory of the command
+    :param kwargs: Extra arguments forwarded to asyncio.create_subprocess_exec
+    :return: Process return code (always 0)
+    :raises subprocess.CalledProcessError: Command exited with non-zero status
+    :raises asyncio.CancelledError: Cancelled; the command is killed first
+    """
+    proc = await asyncio.create_subprocess_exec(*cmd, cwd=cwd, **kwargs)
+    try:
+        returncode = await proc.wait()
+    except BaseException:
+        # Cancelled: do not leave the command running
+        await _kill(proc)
+        raise
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+    return returncode
+
+
+async def _kill(proc):
+    """Kill a child process (if still running) and reap it."""
+    try:
+        proc.kill()
+    except ProcessLookupError:
+        pass
+    await proc.wait()
+
+
+async def run_command_stdin(cmd, stream, cwd=None, chunk_size=1 << 20, **kwargs):
+    """
+    Run an external command, feeding a binary stream to its stdin.
+
+    Chunks are read from `stream` in a worker thread (so e.g. gzip
+    decompression does not stall the event loop) and written to the
+    command as they arrive; nothing is staged on disk.
+
+    :param cmd: Command and arguments as a list
+    :param stream: Readable binary file object (e.g. from gzip.open)
+    :param cwd: Working directory of the command
+    :param chunk_size: Size of each read from `stream` (default 1 MiB)
+    :param kwargs: Extra arguments forwarded to asyncio.create_subprocess_exec
+    :return: Process return code (always 0)
+    :raises subprocess.CalledProcessError: Command exited with non-zero status
+    :raises Exception: Any error reading `stream`; the command is killed first
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, cwd=cwd, stdin=asyncio.subprocess.PIPE, **kwargs
+    )
+    try:
+        while True:
+            chunk = await asyncio.to_thread(stream.read, chunk_size)
+            if not chunk:
+                break
+            proc.stdin.write(chunk)
+            await proc.stdin.drain()
+        proc.stdin.close()
+    except (BrokenPipeError, ConnectionResetError):
+        # Command exited before consuming all input; report its status below
+        pass
+    except BaseException:
+        # Reading the input failed (e.g. truncated gzip) or we were cancelled:
+        # stop the command rather than let it finish on partial input
+        await _kill(proc)
+        raise
+
+    returncode = await proc.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+    return returncode
+
+
+async def run_piped(producer_cmd, consumer_cmd, cwd=None, **kwargs):
+    """
+    Run two external commands with the first one's stdout piped into
+    the second one's stdin (like ``producer | consumer`` in a shell).
+
+    The data flows through an OS pipe between the two processes and
+    never passes through Python.
+
+    :param producer_cmd: Command writing to stdout (e.g. a decompressor)
+    :param consumer_cmd: Command reading from stdin
+    :param cwd: Working directory of the consumer
+    :param kwargs: Extra arguments forwarded to the consumer's create_subprocess_exec
+    :return: Consumer return code (always 0)
+    :raises subprocess.CalledProcessError: Either command exited with non-zero status.
+        The consumer may already have written output by then; callers must
+        treat it as invalid.
+    """
+    read_fd, write_fd = os.pipe()
+    try:
+        producer = await asyncio.create_subprocess_exec(*producer_cmd, stdout=write_fd)
+        consumer = await asyncio.create_subprocess_exec(
+            *consumer_cmd, cwd=cwd, stdin=read_fd, **kwargs
+        )
+    finally:
+        # The children hold their own copies of the pipe ends
+        os.close(read_fd)
+        os.close(write_fd)
+
+    try:
+        consumer_rc, producer_rc = await asyncio.gather(consumer.wait(), producer.wait())
+    except BaseException:
+        # Cancelled: do not leave either side running
+        await asyncio.gather(_kill(consumer), _kill(producer))
+        raise
+
+    # A failing consumer makes the producer die of SIGPIPE; report the root cause
+    if consumer_rc != 0:
+        raise subprocess.CalledProcessError(consumer_rc, consumer_cmd)
+    if producer_rc != 0:
+        raise subprocess.CalledProcessError(producer_rc, producer_cmd)
+    return consumer_rc
@@ -2,23 +2,26 @@
 Simple runner for the valrep
 
 This module loads the config, expands the parameter space,
-builds job names, and runs each point through the workflow.
+builds job names, and runs the points through the workflow in parallel,
+either locally or as a SLURM array job.
 """
 
+import asyncio
+
+from valrep.batch import run_batch
 from valrep.workflow_manager import Workflow
 from valrep.modifiers import ParameterSpaceModifier, JobNameModifier
 from valrep.config_loader import load_config
 
 
-def run_workflow(config_path, steps_override=None, workdir=None):
+def build_workflow(config, steps_override=None, workdir=None):
     """
-    Load the configuration file and run the workflow for each
-    parameter point generated by the modifiers.
+    Create a Workflow and add its steps.
 
     Parameters
     ----------
-    config_path : str
-        Path to the workflow configuration file.
+    config : dict
+        Full workflow configuration.
     steps_override : list[str], optional
         If provided, these step names override the ones in the config.
     workdir : str, optional
@@ -26,36 +29,81 @@ def run_workflow(config_path, steps_override=None, workdir=None):
 
     Returns
     -------
-    None
-        The function prints progress and dispatches each workflow run.
+    Workflow
+        Workflow with its step instances in order.
     """
-    # Load YAML/JSON config into memory
-    config = load_config(config_path)
-
     # Create workflow instance; default output path is local folder
     workflow = Workflow(config, workdir=workdir or "./all_points_runs")
 
     # Add workflow steps from CLI override or from the config file
-    if steps_override:
-        for step_name in steps_override:
-            workflow.add_step(step_name)
-    else:
-        for step_name in config.get("steps", []):
-            workflow.add_step(step_name)
+    for step_name in steps_override or config.get("steps", []):
+        workflow.add_step(step_name)
 
+    return workflow
+
+
+def generate_points(config):
+    """
+    Yield the configuration of every parameter point, with its job name.
+
+    The order is deterministic, so the n-th yielded point is the same
+    in every process (used to map SLURM array indices to points).
+
+    Parameters
+    ----------
+    config : dict
+        Full workflow configuration.
+    """
     # Set up parameter sweeping + job naming
     param_modifier = ParameterSpaceModifier()
     job_modifier = JobNameModifier()
 
-    # Iterate through all parameter combinations
+    # Attach a unique job name to every parameter combination
     for cfg in param_modifier.generate(**config):
-        # Attach a unique job name
-        cfg = job_modifier.modify(**cfg)
-        point_name = cfg["job_name"]
+        yield job_modifier.modify(**cfg)
+
+
+def run_workflow(config_path, steps_override=None, workdir=None, max_workers=None, backend=None):
+    """
+    Load the configuration file and run the workflow for each
+    parameter point generated by the modifiers.
+
+    Parameters
+    ----------
+    config_path : str
+        Path to the workflow configuration file.
+    steps_override : list[str], optional
+        If provided, these step names override the ones in the config.
+    workdir : str, optional
+        Output directory for all generated runs.
+    max_workers : int, optional
+        Number of parameter points run concurrently. Defaults to the CPU count.
+    backend : str, optional
+        "local" (default) runs the points in this process; "slurm" submits
+        them as SLURM array jobs. Overrides the config's `backend` key.
+
+    Returns
+    -------
+    None
+        The function prints progress and dispatches each workflow run.
+    """
+    # Load YAML/JSON config into memory
+    config = load_config(config_path)
 
-        print(f"\n### POINT: {point_name} ###")
+    backend = (backend or config.get("backend", "local")).lower()
+    if backend == "slurm":
+        from valrep.scheduler import submit_slurm_array
+        submit_slurm_array(
+            config_path,
+            config,
+            workdir=workdir or "./all_points_runs",
+            steps_override=steps_override,
+        )
+        return
+    if backend != "local":
+        raise ValueError(f"Unknown backend: {backend}")
 
-        # Execute the workflow for this parameter point
-        result = workflow.run(point_name)
+    workflow = build_workflow(config, steps_override, workdir)
 
-        print(f"Results [{point_name}]: {result}")
+    # Execute the workflow for all points, several at a time
+    asyncio.run(run_batch(workflow, generate_points(config), max_workers=max_workers))
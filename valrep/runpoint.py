@@ -0,0 +1,76 @@
+"""
+Run a single parameter point of the valrep grid.
+
+This is the body of each SLURM array task (see valrep.scheduler):
+
+    python -m valrep.runpoint --config <cfg> --workdir <dir> <index>
+
+The index selects the point in the same deterministic order used by
+the local runner.
+"""
+
+import argparse
+import asyncio
+from itertools import islice
+
+from valrep.batch import run_point
+from valrep.config_loader import load_config
+from valrep.manifest import set_journal_mode
+from valrep.runner import build_workflow, generate_points
+
+
+def run_single_point(config_path, index, steps_override=None, workdir=None):
+    """
+    Run all workflow steps for the `index`-th parameter point.
+
+    Parameters
+    ----------
+    config_path : str
+        Path to the workflow configuration file.
+    index : int
+        Zero-based position of the point in the parameter grid.
+    steps_override : list[str], optional
+        If provided, these step names override the ones in the config.
+    workdir : str, optional
+        Output directory for all generated runs.
+
+    Returns
+    -------
+    Any
+        The output of the last step for this point.
+
+    Raises
+    ------
+    IndexError
+        If the grid has no point with this index.
+    """
+    config = load_config(config_path)
+
+    # Tasks on many nodes share the manifest: WAL is not safe there
+    set_journal_mode("DELETE")
+
+    point_cfg = next(islice(generate_points(config), index, None), None)
+    if point_cfg is None:
+        raise IndexError(f"No parameter point with index {index}")
+
+    workflow = build_workflow(config, steps_override, workdir)
+    result = asyncio.run(run_point(workflow, point_cfg))
+    print(f"Results [{point_cfg['job_name']}]: {result}")
+    return result
+
+
+def main(argv=None):
+    """Parse CLI arguments and run one parameter point."""
+    parser = argparse.ArgumentParser(description="Run one valrep parameter point")
+    parser.add_argument("index", type=int, help="Index of the point in the grid")
+    parser.add_argument("--config", required=True, help="Path to config file (JSON/YAML)")
+    parser.add_argument("--steps", help="Comma-separated steps")
+    parser.add_argument("--workdir", default="./all_points_runs", help="Directory to store outputs")
+    args = parser.parse_args(argv)
+
+    steps_override = [s.strip().lower() for s in args.steps.split(",")] if args.steps else None
+    run_single_point(args.config, args.index, steps_override=steps_override, workdir=args.workdir)
+
+
+if __name__ == "__main__":
+    main()
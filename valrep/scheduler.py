@@ -0,0 +1,160 @@
+"""
+SLURM backend for the valrep
+
+This module writes the parameter grid as SLURM array jobs, one array
+task per parameter point. Grids larger than the cluster's MaxArraySize
+are split into several arrays, each covering a consecutive range of
+points. Each task runs ``python -m valrep.runpoint <index>`` for its point.
+"""
+
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+
+from valrep.runner import generate_points
+
+# Project root; put on the tasks' PYTHONPATH so `valrep` is importable
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Tasks per array; SLURM's default MaxArraySize (1001) allows indices 0-1000
+DEFAULT_MAX_ARRAY_SIZE = 1000
+
+
+def write_slurm_array(config_path, config, workdir, steps_override=None):
+    """
+    Write the sbatch scripts for the parameter grid.
+
+    The optional `slurm` config section controls the jobs:
+
+    * ``cpus_per_task`` — cores per point, match MG5/Delphes threading (default 1)
+    * ``max_array_size`` — tasks per array job, at most the cluster's
+      MaxArraySize (default 1000); larger grids get several array jobs
+    * ``max_concurrent`` — cap on simultaneously running tasks (``%M``), per array job
+    * ``partition``, ``time``, ``mem`` — passed through to sbatch
+    * ``job_name`` — SLURM job name (default "valrep")
+
+    Parameters
+    ----------
+    config_path : str
+        Path to the workflow configuration file, re-read by every task.
+    config : dict
+        Full workflow configuration.
+    workdir : str
+        Output directory for all generated runs.
+    steps_override : list[str], optional
+        If provided, these step names override the ones in the config.
+
+    Returns
+    -------
+    tuple[list[str], int]
+        Paths to the written scripts and the number of points in the grid.
+
+    Raises
+    ------
+    ValueError
+        If `max_array_size` is less than 1.
+    """
+    workdir = os.path.abspath(workdir)
+    slurm_cfg = config.get("slurm", {})
+
+    n_points = sum(1 for _ in generate_points(config))
+    if n_points == 0:
+        return [], 0
+
+    max_array_size = int(slurm_cfg.get("max_array_size", DEFAULT_MAX_ARRAY_SIZE))
+    if max_array_size < 1:
+        raise ValueError(f"slurm.max_array_size must be greater than 0, got {max_array_size}")
+
+    log_dir = os.path.join(workdir, "slurm_logs")
+    os.makedirs(log_dir, exist_ok=True)
+
+    directives = [
+        f"--job-name={slurm_cfg.get('job_name', 'valrep')}",
+        f"--cpus-per-task={int(slurm_cfg.get('cpus_per_task', 1))}",
+        f"--output={os.path.join(log_dir, '%A_%a.out')}",
+    ]
+    for key in ("partition", "time", "mem"):
+        if slurm_cfg.get(key):
+            directives.append(f"--{key}={slurm_cfg[key]}")
+
+    task_cmd = [
+        sys.executable, "-m", "valrep.runpoint",
+        "--config", os.path.abspath(config_path),
+        "--workdir", workdir,
+    ]
+    if steps_override:
+        task_cmd += ["--steps", ",".join(steps_override)]
+
+    task_line = " ".join(shlex.quote(arg) for arg in task_cmd)
+
+    script_paths = []
+    for offset in range(0, n_points, max_array_size):
+        # Array indices restart at 0 in every job; the offset maps them to grid points
+        array = f"0-{min(max_array_size, n_points - offset) - 1}"
+        if slurm_cfg.get("max_concurrent"):
+            array += f"%{int(slurm_cfg['max_concurrent'])}"
+
+        suffix = f"_{offset // max_array_size}" if n_points > max_array_size else ""
+        script_path = os.path.join(workdir, f"valrep_array{suffix}.sbatch")
+        with open(script_path, "w") as f:
+            f.write("#!/bin/bash\n")
+            f.write(f"#SBATCH --array={array}\n")
+            for directive in directives:
+                f.write(f"#SBATCH {directive}\n")
+            f.write("\n")
+            # Run from the submit directory, like bin/valrep, so relative
+            # config paths (cards, templates, workdir) resolve the same way
+            f.write(f"cd {shlex.quote(os.getcwd())}\n")
+            f.write(f'export PYTHONPATH={shlex.quote(ROOT_DIR)}${{PYTHONPATH:+:$PYTHONPATH}}\n')
+            f.write(f'{task_line} "$((SLURM_ARRAY_TASK_ID + {offset}))"\n')
+        script_paths.append(script_path)
+
+    return script_paths, n_points
+
+
+def submit_slurm_array(config_path, config, workdir, steps_override=None):
+    """
+    Write the sbatch scripts for the parameter grid and submit them.
+
+    The environment (MG5_EXEC, DELPHES_EXEC, CLA_EXEC) is inherited by
+    the tasks through sbatch's default ``--export=ALL``.
+
+    Parameters
+    ----------
+    config_path : str
+        Path to the workflow configuration file.
+    config : dict
+        Full workflow configuration.
+    workdir : str
+        Output directory for all generated runs.
+    steps_override : list[str], optional
+        If provided, these step names override the ones in the config.
+
+    Returns
+    -------
+    list[str]
+        Paths to the submitted scripts (empty if the grid is empty).
+
+    Raises
+    ------
+    FileNotFoundError
+        If `sbatch` is not available.
+    """
+    script_paths, n_points = write_slurm_array(config_path, config, workdir, steps_override)
+    if not script_paths:
+        print("No parameter points to submit.")
+        return script_paths
+
+    sbatch = shutil.which("sbatch")
+    if sbatch is None:
+        raise FileNotFoundError(
+            f"sbatch not found; array script(s) written to {', '.join(script_paths)}"
+        )
+
+    print(f"Submitting {n_points} point(s) as {len(script_paths)} SLURM array job(s)")
+    for script_path in script_paths:
+        print(f"  {script_path}")
+        subprocess.run([sbatch, script_path], check=True)
+    return script_paths
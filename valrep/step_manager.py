@@ -1,7 +1,12 @@
 import importlib.util
 import os
+import stat
 from typing import Dict, Type, Optional
 
+# Step classes already imported in this process, keyed by
+# (steps_dir, ((step_name, step_file, mtime_ns), ...))
+_REGISTRY_CACHE: Dict[tuple, Dict[str, Type]] = {}
+
 class StepManager:
     """
     Discover and manage workflow steps dynamically.
@@ -40,31 +45,66 @@ class StepManager:
         Scan the steps directory and register all step classes.
 
         Each step should be in a subfolder and contain a `step.py` file
-        with a single class representing the step.
+        defining the step class and naming it in `STEP_CLASS`. Results are cached
+        per process, keyed by the steps directory and the modification
+        times of the step files, so repeated constructions skip the imports.
+        """
+        step_files = []
+        with os.scandir(self.steps_dir) as entries:
+            for entry in entries:
+                # DirEntry carries the file type, so no extra stat per entry
+                if not entry.is_dir():
+                    continue
+
+                # Only consider directories that contain step.py
+                step_file = os.path.join(entry.path, "step.py")
+                try:
+                    st = os.stat(step_file)
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    step_files.append((entry.name, step_file, st.st_mtime_ns))
+
+        cache_key = (self.steps_dir, tuple(sorted(step_files)))
+        cached = _REGISTRY_CACHE.get(cache_key)
+        if cached is not None:
+            self.registry.update(cached)
+            return
+
+        for step_name, step_file, _ in step_files:
+            # Register step with lowercase name for convenience
+            self.registry[step_name.lower()] = self._load_step_class(step_name, step_file)
+
+        _REGISTRY_CACHE[cache_key] = dict(self.registry)
+
+    @staticmethod
+    def _load_step_class(step_name: str, step_file: str) -> Type:
         """
-        for step_name in os.listdir(self.steps_dir):
-            step_folder = os.path.join(self.steps_dir, step_name)
-            step_file = os.path.join(step_folder, "step.py")
-
-            # Only consider directories that contain step.py
-            if os.path.isdir(step_folder) and os.path.isfile(step_file):
-                spec = importlib.util.spec_from_file_location(f"{step_name}.step", step_file)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-
-                # Pick the first class found in the module
-                step_cls = None
-                for attr_name in dir(module):
-                    attr = getattr(module, attr_name)
-                    if isinstance(attr, type):
-                        step_cls = attr
-                        break
-
-                if step_cls is None:
-                    raise ValueError(f"No class found in {step_file}")
-
-                # Register step with lowercase name for convenience
-                self.registry[step_name.lower()] = step_cls
+        Import a step module from file and return its step class.
+
+        The class is taken from the module's `STEP_CLASS` attribute; modules
+        without it fall back to the first class found in their namespace.
+
+        Raises
+        ------
+        ValueError
+            If the module defines no class.
+        """
+        spec = importlib.util.spec_from_file_location(f"{step_name}.step", step_file)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        step_cls = getattr(module, "STEP_CLASS", None)
+        if step_cls is not None:
+            return step_cls
+
+        # Fallback: pick the first class found in the module
+        for attr_name in dir(module):
+            attr = getattr(module, attr_name)
+            if isinstance(attr, type):
+                return attr
+
+        raise ValueError(f"No class found in {step_file}")
 
     def get_step(self, name: str, config: Optional[dict] = None):
         """
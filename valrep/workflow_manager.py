@@ -1,3 +1,4 @@
+import inspect
 import os
 from valrep.step_manager import StepManager
 
@@ -55,17 +56,21 @@ class Workflow:
         step = self.step_manager.get_step(step_name, config=step_config)
         self.steps.append(step)
 
-    def run(self, point_name: str):
+    async def run(self, point_name: str, config=None):
         """
         Run all workflow steps sequentially for a given parameter point.
 
         Each step receives the full config, the output directory
-        for this point, and the previous step's output.
+        for this point, and the previous step's output. Steps may
+        implement `run` either as a plain or as an `async` method.
 
         Parameters
         ----------
         point_name : str
             Unique name of the parameter point (usually generated by JobNameModifier).
+        config : dict, optional
+            Configuration of this parameter point (as yielded by
+            ParameterSpaceModifier). Defaults to the workflow config.
 
         Returns
         -------
@@ -75,14 +80,18 @@ class Workflow:
 
         Example
         -------
-        >>> results = workflow.run("SS_direct.100p0_50p0.13p0")
+        >>> results = asyncio.run(workflow.run("SS_direct.100p0_50p0.13p0"))
         """
         point_dir = os.path.join(self.workdir, point_name)
         os.makedirs(point_dir, exist_ok=True)
 
+        point_config = self.config if config is None else config
+
         prev_output = None
         for step in self.steps:
             print(f"--- Running {step.name} ---")
-            prev_output = step.run(self.config, point_dir, prev_output)
+            prev_output = step.run(point_config, point_dir, prev_output)
+            if inspect.isawaitable(prev_output):
+                prev_output = await prev_output
 
         return prev_output